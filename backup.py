@@ -1,59 +1,69 @@
-import os
-from datetime import datetime
-
-def create_backup():
-    # Output file
-    backup_file = 'backup.txt'
-    
-    # Files and directories to ignore
-    ignore_files = {'README.md', 'backup.py', 'backup.txt'}
-    ignore_dirs = {'__pycache__'}
-    
-    # Get current directory structure
-    def get_directory_structure(start_path):
-        structure = []
-        for root, dirs, files in os.walk(start_path):
-            # Remove ignored directories
-            dirs[:] = [d for d in dirs if d not in ignore_dirs]
-            
-            level = root.replace(start_path, '').count(os.sep)
-            indent = '  ' * level
-            structure.append(f'{indent}{os.path.basename(root)}/')
-            for file in files:
-                if file not in ignore_files:
-                    structure.append(f'{indent}  {file}')
-        return '\n'.join(structure)
-
-    # Create backup content
-    with open(backup_file, 'w', encoding='utf-8') as backup:
-        # Write directory structure
-        backup.write("Directory Structure:\n")
-        backup.write("==================\n")
-        backup.write(get_directory_structure('.') + "\n\n")
-        
-        # Write file contents
-        backup.write("File Contents:\n")
-        backup.write("=============\n\n")
-        
-        # Walk through directory
-        for root, dirs, files in os.walk('.'):
-            # Skip ignored directories
-            dirs[:] = [d for d in dirs if d not in ignore_dirs]
-            
-            for file in files:
-                if file.endswith('.py') and file not in ignore_files:
-                    file_path = os.path.join(root, file)
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                            
-                        backup.write(f"File: {file_path}\n")
-                        backup.write("=" * (len(file_path) + 6) + "\n")
-                        backup.write(content)
-                        backup.write("\n\n")
-                    except Exception as e:
-                        backup.write(f"Error reading {file_path}: {str(e)}\n\n")
-
-if __name__ == "__main__":
-    create_backup()
-    print("Backup completed successfully!")
\ No newline at end of file
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+def create_backup():
+    # Output file
+    backup_file = 'backup.txt'
+
+    # Files and directories to ignore
+    ignore_files = {'README.md', 'backup.py', 'backup.txt'}
+    ignore_dirs = {'__pycache__'}
+
+    structure = []
+    py_files = []
+
+    # Single scandir-based walk: DirEntry caches the stat info, so this
+    # collects both the tree listing and the .py paths in one pass instead
+    # of two os.walk traversals
+    def scan_tree(path, level):
+        indent = '  ' * level
+        structure.append(f'{indent}{os.path.basename(path)}/')
+        subdirs = []
+        with os.scandir(path) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in ignore_dirs:
+                        subdirs.append(entry.path)
+                elif entry.name not in ignore_files:
+                    structure.append(f'{indent}  {entry.name}')
+                    if entry.name.endswith('.py'):
+                        py_files.append(entry.path)
+        for subdir in subdirs:
+            scan_tree(subdir, level + 1)
+
+    scan_tree('.', 0)
+
+    def read_file(file_path):
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                return file_path, f.read(), None
+        except Exception as e:
+            return file_path, None, e
+
+    # Read source files concurrently; the walk above already ordered them
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        contents = list(pool.map(read_file, py_files))
+
+    # Create backup content through one large-buffer writer
+    with open(backup_file, 'w', encoding='utf-8', buffering=1024 * 1024) as backup:
+        # Write directory structure
+        backup.write("Directory Structure:\n")
+        backup.write("==================\n")
+        backup.write('\n'.join(structure) + "\n\n")
+
+        # Write file contents
+        backup.write("File Contents:\n")
+        backup.write("=============\n\n")
+
+        for file_path, content, error in contents:
+            if error is not None:
+                backup.write(f"Error reading {file_path}: {str(error)}\n\n")
+            else:
+                backup.write(f"File: {file_path}\n")
+                backup.write("=" * (len(file_path) + 6) + "\n")
+                backup.write(content)
+                backup.write("\n\n")
+
+if __name__ == "__main__":
+    create_backup()
+    print("Backup completed successfully!")
@@ -1,261 +1,577 @@
-# File: karate_chunk.py
-
-import os
-import json
-from datetime import datetime
-from typing import Dict, Optional, Tuple, List
-from roundhouse.dojo_handlers import FileOperations
-
-class ChunkManager:
-    """Manages the chunking process."""
-    
-    def __init__(self, logger):
-        """Initialize ChunkManager with logger."""
-        self.logger = logger
-        self.file_ops = FileOperations()
-    
-    def _generate_chunk_id(self, base_filename: str, chunk_number: int) -> str:
-        """Generate chunk ID using the original filename pattern.
-        
-        Args:
-            base_filename (str): Original filename without extension
-            chunk_number (int): Current chunk number
-            
-        Returns:
-            str: Formatted chunk filename (e.g., filename.chunk001.bin)
-        """
-        return f"{base_filename}.chunk{chunk_number:03d}.bin"
-    
-    def _initialize_inventory(self, input_file: str, file_hash: str, file_size: int, 
-                            chunk_size: int, inventory_path: str) -> Dict:
-        """Initialize inventory with all chunks pre-populated.
-        
-        Args:
-            input_file (str): Path to the original input file
-            file_hash (str): Hash of the original file
-            file_size (int): Size of the original file in bytes
-            chunk_size (int): Size of each chunk in bytes
-            inventory_path (str): Path where inventory will be saved
-            
-        Returns:
-            Dict: Complete inventory structure with pending chunks
-        """
-        total_chunks = (file_size + chunk_size - 1) // chunk_size
-        base_filename = os.path.splitext(os.path.basename(input_file))[0]
-        
-        inventory = {
-            "original_filename": os.path.basename(input_file),
-            "original_size": file_size,
-            "original_hash": file_hash,
-            "hash_type": self.file_ops.get_hash_type(),
-            "chunk_size": chunk_size,
-            "total_chunks": total_chunks,
-            "inventory_type": "progressive",
-            "creation_time": datetime.now().isoformat(),
-            "last_updated": datetime.now().isoformat(),
-            "inventory_file": os.path.basename(inventory_path),
-            "chunk_status": {
-                "total_processed": 0,
-                "chunks_remaining": total_chunks
-            },
-            "chunks": {}
-        }
-        
-        # Pre-populate all chunks with pending status
-        for chunk_num in range(1, total_chunks + 1):
-            start_pos = (chunk_num - 1) * chunk_size
-            expected_size = min(chunk_size, file_size - start_pos)
-            
-            inventory["chunks"][str(chunk_num)] = {
-                "status": "pending",
-                "chunk_id": self._generate_chunk_id(base_filename, chunk_num),
-                "chunk_number": chunk_num,
-                "offset": start_pos,
-                "expected_size": expected_size
-            }
-        
-        return inventory
-    
-    def _load_or_create_inventory(self, input_file: str, inventory_path: str, 
-                                file_hash: str, file_size: int, chunk_size: int) -> Dict:
-        """Load existing inventory or create new one if it doesn't exist.
-        
-        Args:
-            input_file (str): Path to the original input file
-            inventory_path (str): Path to inventory file
-            file_hash (str): Hash of the original file
-            file_size (int): Size of the original file in bytes
-            chunk_size (int): Size of each chunk in bytes
-            
-        Returns:
-            Dict: Loaded or newly created inventory
-        """
-        try:
-            if os.path.exists(inventory_path):
-                with open(inventory_path, 'r') as f:
-                    inventory = json.load(f)
-                self.logger.log_info(f"Loaded existing inventory: {inventory_path}")
-                return inventory
-        except Exception as e:
-            self.logger.log_error(f"Error loading inventory: {str(e)}")
-        
-        self.logger.log_info(f"Creating new inventory: {inventory_path}")
-        return self._initialize_inventory(input_file, file_hash, file_size, 
-                                       chunk_size, inventory_path)
-    
-    def _update_inventory(self, inventory: Dict, chunk_num: int, chunk_info: Dict) -> Dict:
-        """Update inventory with completed chunk information.
-        
-        Args:
-            inventory (Dict): Current inventory
-            chunk_num (int): Number of the chunk being updated
-            chunk_info (Dict): New information for the chunk
-            
-        Returns:
-            Dict: Updated inventory
-        """
-        chunk_key = str(chunk_num)
-        
-        # Update chunk information
-        inventory["chunks"][chunk_key].update({
-            "status": "completed",
-            "size": chunk_info["size"],
-            "hash": chunk_info["hash"],
-            "processing_time": chunk_info["processing_time"],
-            "completed_at": datetime.now().isoformat()
-        })
-        
-        # Update status counters
-        inventory["chunk_status"]["total_processed"] = sum(
-            1 for chunk in inventory["chunks"].values() 
-            if chunk["status"] == "completed"
-        )
-        inventory["chunk_status"]["chunks_remaining"] = (
-            inventory["total_chunks"] - inventory["chunk_status"]["total_processed"]
-        )
-        inventory["last_updated"] = datetime.now().isoformat()
-        
-        return inventory
-    
-    def calculate_chunk_boundaries(self, file_size: int, chunk_size: int, chunk_number: int) -> Tuple[int, int]:
-        """Calculate the start and end positions for a specific chunk.
-        
-        Args:
-            file_size (int): Total size of the file in bytes
-            chunk_size (int): Size of each chunk in bytes
-            chunk_number (int): The chunk number to calculate boundaries for
-            
-        Returns:
-            Tuple[int, int]: (start_position, end_position)
-            
-        Raises:
-            ValueError: If chunk number is beyond file size
-        """
-        zero_based_chunk = chunk_number - 1
-        start_position = zero_based_chunk * chunk_size
-        end_position = min(start_position + chunk_size, file_size)
-        
-        if start_position >= file_size:
-            raise ValueError(f"Chunk number {chunk_number} is beyond file size")
-            
-        return start_position, end_position
-    
-    def chunk_file(self, input_file: str, output_dir: str, inventory_path: str,
-                   chunk_size_mb: int = 1000, specific_chunk: Optional[int] = None) -> Dict:
-        """Chunk file according to specifications."""
-        chunk_size = chunk_size_mb * 1024 * 1024  # Convert MB to bytes
-        base_filename = os.path.splitext(os.path.basename(input_file))[0]
-        
-        # Calculate hash and get file size
-        self.logger.log_sequence("HASH", "START", f"Calculating file {self.file_ops.get_hash_type()} hash...")
-        file_hash, file_size = self.file_ops.calculate_hash(input_file)
-        self.logger.log_sequence("HASH", "COMPLETE", f"Hash: {file_hash[:16]}...")
-        
-        # Load or create inventory
-        inventory = self._load_or_create_inventory(
-            input_file, inventory_path, file_hash, file_size, chunk_size
-        )
-        
-        total_chunks = inventory["total_chunks"]
-        
-        # Determine which chunks to process
-        if specific_chunk is not None:
-            if specific_chunk < 1 or specific_chunk > total_chunks:
-                raise ValueError(f"Chunk number must be between 1 and {total_chunks}")
-            chunks_to_process = [specific_chunk]
-            self.logger.log_info(f"Processing single chunk {specific_chunk}/{total_chunks}")
-        else:
-            chunks_to_process = [i for i in range(1, total_chunks + 1)
-                               if inventory["chunks"][str(i)]["status"] == "pending"]
-        
-        self.logger.log_sequence("CHUNKING", "START", 
-                               f"Processing {len(chunks_to_process)} chunks")
-        
-        input_file_handle = None
-        try:
-            # Open the input file once
-            input_file_handle = open(input_file, 'rb')
-            
-            for chunk_num in chunks_to_process:
-                chunk_start = datetime.now()
-                chunk_id = self._generate_chunk_id(base_filename, chunk_num)
-                output_path = os.path.join(output_dir, chunk_id)
-                
-                # Show progress
-                progress = (chunk_num/total_chunks*100) if not specific_chunk else 100
-                print(f"\rProcessing chunk {chunk_num}/{total_chunks} "
-                      f"({progress:.1f}%) - {chunk_id}", end="", flush=True)
-                
-                # Calculate chunk boundaries
-                start_pos, end_pos = self.calculate_chunk_boundaries(file_size, chunk_size, chunk_num)
-                chunk_size_actual = end_pos - start_pos
-                
-                # Read chunk
-                input_file_handle.seek(start_pos)
-                chunk_data = input_file_handle.read(chunk_size_actual)
-                
-                # Write chunk
-                os.makedirs(output_dir, exist_ok=True)
-                with open(output_path, 'wb') as chunk_file:
-                    chunk_file.write(chunk_data)
-                
-                # Calculate chunk hash
-                chunk_hash = self.file_ops.calculate_chunk_hash(chunk_data)
-                
-                chunk_info = {
-                    "size": chunk_size_actual,
-                    "hash": chunk_hash,
-                    "processing_time": (datetime.now() - chunk_start).total_seconds()
-                }
-                
-                # Update inventory
-                inventory = self._update_inventory(inventory, chunk_num, chunk_info)
-                
-                # Save inventory after each chunk
-                with open(inventory_path, 'w') as f:
-                    json.dump(inventory, f, indent=2)
-                
-                self.logger.log_chunk_operation(
-                    chunk_id=chunk_id,
-                    status="completed",
-                    start_time=chunk_start,
-                    end_time=datetime.now(),
-                    size=chunk_size_actual,
-                    chunk_hash=chunk_hash,
-                    output_path=output_path,
-                    offset=start_pos
-                )
-        
-        finally:
-            # Ensure we always close the input file
-            if input_file_handle:
-                input_file_handle.close()
-        
-        print("\n")  # New line after progress
-        
-        # Print summary
-        print(f"\nChunking Status:")
-        print(f"Processed: {inventory['chunk_status']['total_processed']}/{total_chunks}")
-        print(f"Remaining: {inventory['chunk_status']['chunks_remaining']}")
-        
+# File: karate_chunk.py
+
+import os
+import mmap
+import time
+import queue
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Optional, Tuple, List
+from roundhouse.dojo_handlers import FileOperations, InventoryManager, create_hasher, _loads
+
+class ChunkManager:
+    """Manages the chunking process."""
+
+    # Checkpoint cadence: rewrite the inventory at most once per batch of
+    # chunks or flush interval, whichever comes first
+    _FLUSH_EVERY_CHUNKS = 16
+    _FLUSH_INTERVAL_SECONDS = 5.0
+
+    # Total bytes the no-mmap buffer pool may hold; this path runs
+    # precisely when mapping the source already failed for lack of
+    # memory or address space, so it must stay frugal
+    _FALLBACK_POOL_BUDGET = 1024 ** 3
+
+    def __init__(self, logger):
+        """Initialize ChunkManager with logger."""
+        self.logger = logger
+        self.file_ops = FileOperations()
+        self._dirty_count = 0
+        self._last_flush = time.monotonic()
+
+    def _maybe_flush_inventory(self, inventory: Dict, inventory_path: str,
+                               force: bool = False) -> bool:
+        """Checkpoint the inventory, amortized over many chunk updates.
+
+        Rewriting the whole inventory after every chunk makes checkpoint
+        I/O quadratic in chunk count; batching bounds the worst-case loss
+        on a crash to one batch of chunk records.
+
+        Args:
+            inventory (Dict): Current inventory
+            inventory_path (str): Path to write the checkpoint to
+            force (bool): Write unconditionally (end of run / error paths)
+
+        Returns:
+            bool: True if a checkpoint was actually written
+        """
+        if not force:
+            self._dirty_count += 1
+            if (self._dirty_count < self._FLUSH_EVERY_CHUNKS
+                    and time.monotonic() - self._last_flush < self._FLUSH_INTERVAL_SECONDS):
+                return False
+        InventoryManager.write_inventory(inventory, inventory_path)
+        self._dirty_count = 0
+        self._last_flush = time.monotonic()
+        return True
+    
+    @staticmethod
+    def _chunk_shift(chunk_size: int) -> Optional[int]:
+        """Return log2(chunk_size) when it is a power of two.
+
+        Common sizes (64/128/256/512/1024 MB) are powers of two, which lets
+        chunk arithmetic use shifts instead of generic division.
+
+        Args:
+            chunk_size (int): Chunk size in bytes
+
+        Returns:
+            Optional[int]: The shift amount, or None for non-power-of-two sizes
+        """
+        if chunk_size > 0 and chunk_size & (chunk_size - 1) == 0:
+            return chunk_size.bit_length() - 1
+        return None
+
+    def _generate_chunk_id(self, base_filename: str, chunk_number: int) -> str:
+        """Generate chunk ID using the original filename pattern.
+        
+        Args:
+            base_filename (str): Original filename without extension
+            chunk_number (int): Current chunk number
+            
+        Returns:
+            str: Formatted chunk filename (e.g., filename.chunk001.bin)
+        """
+        return f"{base_filename}.chunk{chunk_number:03d}.bin"
+    
+    def _initialize_inventory(self, input_file: str, file_hash: str, file_size: int, 
+                            chunk_size: int, inventory_path: str) -> Dict:
+        """Initialize inventory with all chunks pre-populated.
+        
+        Args:
+            input_file (str): Path to the original input file
+            file_hash (str): Hash of the original file
+            file_size (int): Size of the original file in bytes
+            chunk_size (int): Size of each chunk in bytes
+            inventory_path (str): Path where inventory will be saved
+            
+        Returns:
+            Dict: Complete inventory structure with pending chunks
+        """
+        shift = self._chunk_shift(chunk_size)
+        if shift is not None:
+            total_chunks = (file_size + chunk_size - 1) >> shift
+        else:
+            total_chunks = (file_size + chunk_size - 1) // chunk_size
+        base_filename = os.path.splitext(os.path.basename(input_file))[0]
+        
+        inventory = {
+            "original_filename": os.path.basename(input_file),
+            "original_size": file_size,
+            "original_hash": file_hash,
+            "hash_type": self.file_ops.get_hash_type(),
+            "chunk_size": chunk_size,
+            "total_chunks": total_chunks,
+            "inventory_type": "progressive",
+            "creation_time": datetime.now().isoformat(),
+            "last_updated": datetime.now().isoformat(),
+            "inventory_file": os.path.basename(inventory_path),
+            "chunk_status": {
+                "total_processed": 0,
+                "chunks_remaining": total_chunks
+            },
+            "chunks": {}
+        }
+        
+        # Pre-populate all chunks with pending status; bind the chunk map
+        # once so the fill loop skips a dict lookup per entry
+        chunks = inventory["chunks"]
+        for chunk_num in range(1, total_chunks + 1):
+            start_pos = (chunk_num - 1) * chunk_size
+            expected_size = min(chunk_size, file_size - start_pos)
+
+            chunks[str(chunk_num)] = {
+                "status": "pending",
+                "chunk_id": f"{base_filename}.chunk{chunk_num:03d}.bin",
+                "chunk_number": chunk_num,
+                "offset": start_pos,
+                "expected_size": expected_size
+            }
+        
+        return inventory
+    
+    def _load_or_create_inventory(self, input_file: str, inventory_path: str, 
+                                file_hash: str, file_size: int, chunk_size: int) -> Dict:
+        """Load existing inventory or create new one if it doesn't exist.
+        
+        Args:
+            input_file (str): Path to the original input file
+            inventory_path (str): Path to inventory file
+            file_hash (str): Hash of the original file
+            file_size (int): Size of the original file in bytes
+            chunk_size (int): Size of each chunk in bytes
+            
+        Returns:
+            Dict: Loaded or newly created inventory
+        """
+        try:
+            if os.path.exists(inventory_path):
+                with open(inventory_path, 'rb') as f:
+                    inventory = _loads(f.read())
+                self.logger.log_info(f"Loaded existing inventory: {inventory_path}")
+                return inventory
+        except Exception as e:
+            self.logger.log_error(f"Error loading inventory: {str(e)}")
+        
+        self.logger.log_info(f"Creating new inventory: {inventory_path}")
+        return self._initialize_inventory(input_file, file_hash, file_size, 
+                                       chunk_size, inventory_path)
+    
+    def _update_inventory(self, inventory: Dict, chunk_num: int, chunk_info: Dict,
+                          timestamp: Optional[str] = None) -> Dict:
+        """Update inventory with completed chunk information.
+
+        Args:
+            inventory (Dict): Current inventory
+            chunk_num (int): Number of the chunk being updated
+            chunk_info (Dict): New information for the chunk
+            timestamp (Optional[str]): ISO timestamp to record; defaults to
+                now. The chunk loop passes one cached string per checkpoint
+                batch so each chunk doesn't pay for a fresh datetime.now()
+
+        Returns:
+            Dict: Updated inventory
+        """
+        if timestamp is None:
+            timestamp = datetime.now().isoformat()
+        entry = inventory["chunks"][str(chunk_num)]
+        was_completed = entry["status"] == "completed"
+
+        # Update chunk information
+        entry.update({
+            "status": "completed",
+            "size": chunk_info["size"],
+            "hash": chunk_info["hash"],
+            "processing_time": chunk_info["processing_time"],
+            "completed_at": timestamp
+        })
+
+        # Only this one entry changed status, so the counters move by at
+        # most one - no need to rescan the whole chunk map
+        if not was_completed:
+            chunk_status = inventory["chunk_status"]
+            chunk_status["total_processed"] += 1
+            chunk_status["chunks_remaining"] -= 1
+        inventory["last_updated"] = timestamp
+
+        return inventory
+    
+    # Serializes the lseek+read fallback in _read_range_into: without
+    # preadv the shared descriptor's file position is the only cursor,
+    # and interleaved seek/read pairs from concurrent workers would
+    # silently mix chunk contents
+    _pread_fallback_lock = threading.Lock()
+
+    @classmethod
+    def _read_range_into(cls, fd: int, view: memoryview, offset: int):
+        """Fill a buffer view with bytes read from a descriptor at an offset.
+
+        Args:
+            fd (int): Open read-only file descriptor, shared between
+                worker threads
+            view (memoryview): Writable view to fill completely
+            offset (int): Byte offset to start reading from
+
+        Raises:
+            IOError: If the file ends before the view is filled
+        """
+        size = len(view)
+        done = 0
+        if hasattr(os, 'preadv'):
+            # Positioned reads never touch the descriptor's file offset,
+            # so workers can read concurrently without coordination
+            while done < size:
+                bytes_read = os.preadv(fd, [view[done:]], offset + done)
+                if bytes_read == 0:
+                    raise IOError(f"Unexpected end of file at offset {offset + done}")
+                done += bytes_read
+            return
+
+        with cls._pread_fallback_lock:
+            while done < size:
+                os.lseek(fd, offset + done, os.SEEK_SET)
+                data = os.read(fd, size - done)
+                bytes_read = len(data)
+                if bytes_read == 0:
+                    raise IOError(f"Unexpected end of file at offset {offset + done}")
+                view[done:done + bytes_read] = data
+                done += bytes_read
+
+    def _process_one_chunk(self, src_fd: int, source_map: Optional[mmap.mmap],
+                           buffer_pool: Optional[queue.Queue], start_pos: int,
+                           end_pos: int, output_path: str) -> Tuple[int, int, str]:
+        """Read, write and hash one chunk range.
+
+        Runs on a worker thread; the kernel copy, positioned reads and the
+        hash update all release the GIL, so neighbouring chunks overlap.
+
+        Args:
+            src_fd (int): Open read-only descriptor for the source file
+            source_map (Optional[mmap.mmap]): Read-only mapping of the source
+            buffer_pool (Optional[queue.Queue]): Reusable buffers for the
+                no-mmap fallback path
+            start_pos (int): Chunk start offset in the source file
+            end_pos (int): Chunk end offset in the source file
+            output_path (str): Destination path for the chunk file
+
+        Returns:
+            Tuple[int, int, str]: (duration_ns, chunk_size, chunk_hash)
+        """
+        start_ns = time.perf_counter_ns()
+        chunk_size_actual = end_pos - start_pos
+
+        pooled_buffer = None
+        if source_map is not None:
+            chunk_view = memoryview(source_map)[start_pos:end_pos]
+        else:
+            pooled_buffer = buffer_pool.get()
+            chunk_view = memoryview(pooled_buffer)[:chunk_size_actual]
+            self._read_range_into(src_fd, chunk_view, start_pos)
+
+        try:
+            # Copy the chunk inside the kernel where supported; the view
+            # only backs the hash (and the fallback write)
+            if not self.file_ops.copy_range(src_fd, output_path,
+                                            start_pos, chunk_size_actual):
+                self.file_ops.write_buffer(output_path, chunk_view)
+
+            chunk_hash = self.file_ops.calculate_chunk_hash(chunk_view)
+        finally:
+            chunk_view.release()
+            if pooled_buffer is not None:
+                buffer_pool.put(pooled_buffer)
+
+        return time.perf_counter_ns() - start_ns, chunk_size_actual, chunk_hash
+
+    def calculate_chunk_boundaries(self, file_size: int, chunk_size: int, chunk_number: int) -> Tuple[int, int]:
+        """Calculate the start and end positions for a specific chunk.
+        
+        Args:
+            file_size (int): Total size of the file in bytes
+            chunk_size (int): Size of each chunk in bytes
+            chunk_number (int): The chunk number to calculate boundaries for
+            
+        Returns:
+            Tuple[int, int]: (start_position, end_position)
+            
+        Raises:
+            ValueError: If chunk number is beyond file size
+        """
+        zero_based_chunk = chunk_number - 1
+        shift = self._chunk_shift(chunk_size)
+        if shift is not None:
+            start_position = zero_based_chunk << shift
+        else:
+            start_position = zero_based_chunk * chunk_size
+        end_position = min(start_position + chunk_size, file_size)
+        
+        if start_position >= file_size:
+            raise ValueError(f"Chunk number {chunk_number} is beyond file size")
+            
+        return start_position, end_position
+    
+    def chunk_file(self, input_file: str, output_dir: str, inventory_path: str,
+                   chunk_size_mb: int = 1000, specific_chunk: Optional[int] = None,
+                   max_workers: Optional[int] = None) -> Dict:
+        """Chunk file according to specifications.
+
+        Args:
+            input_file (str): Path to the file to chunk
+            output_dir (str): Directory for chunk files
+            inventory_path (str): Path for the inventory file
+            chunk_size_mb (int): Chunk size in MB (default 1000)
+            specific_chunk (Optional[int]): Process only this chunk number
+            max_workers (Optional[int]): Worker threads for chunk processing
+                (default: min(8, cpu_count))
+
+        Returns:
+            Dict: The completed inventory
+        """
+        chunk_size = chunk_size_mb * 1024 * 1024  # Convert MB to bytes
+
+        file_size = self.file_ops.get_file_size(input_file)
+
+        # Load or create inventory (hash is filled in once the worker finishes)
+        inventory = self._load_or_create_inventory(
+            input_file, inventory_path, None, file_size, chunk_size
+        )
+
+        # A resumed inventory already carries the whole-file hash - skip
+        # recomputing it. Otherwise it is either folded into the chunk loop
+        # (full run over an mmap) or computed by a background thread.
+        need_file_hash = not inventory.get("original_hash")
+        hash_thread = None
+        hash_result = {}
+
+        total_chunks = inventory["total_chunks"]
+        
+        # Determine which chunks to process
+        if specific_chunk is not None:
+            if specific_chunk < 1 or specific_chunk > total_chunks:
+                raise ValueError(f"Chunk number must be between 1 and {total_chunks}")
+            chunks_to_process = [specific_chunk]
+            self.logger.log_info(f"Processing single chunk {specific_chunk}/{total_chunks}")
+        else:
+            chunks_to_process = [i for i in range(1, total_chunks + 1)
+                               if inventory["chunks"][str(i)]["status"] == "pending"]
+        
+        self.logger.log_sequence("CHUNKING", "START",
+                               f"Processing {len(chunks_to_process)} chunks")
+
+        src_fd = -1
+        source_map = None
+        if max_workers is None:
+            max_workers = min(8, os.cpu_count() or 1)
+        try:
+            # Open the input file once; the mmap view lets us hash chunk
+            # ranges without copying them into Python bytes objects
+            src_fd = os.open(input_file, os.O_RDONLY)
+            self.file_ops.advise_sequential(src_fd)
+            if file_size > 0:
+                try:
+                    source_map = mmap.mmap(src_fd, 0, access=mmap.ACCESS_READ)
+                    # Sequential hint lets the kernel read ahead of the
+                    # chunk cursor and drop pages already consumed
+                    if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                        source_map.madvise(mmap.MADV_SEQUENTIAL)
+                except (OSError, ValueError):
+                    # Mapping can fail for huge files in tight address
+                    # spaces - fall back to positioned reads below
+                    source_map = None
+
+            # When a full run covers every chunk in order and the source is
+            # mapped, the whole-file hash is fed from the same ranges the
+            # workers just read (still hot in the page cache), so the file
+            # is only pulled from disk once. Partial/resume runs fall back
+            # to a background hashing thread overlapping the chunk loop.
+            fused_hasher = None
+            if need_file_hash:
+                if source_map is not None and len(chunks_to_process) == total_chunks:
+                    self.logger.log_sequence("HASH", "START",
+                                             f"Calculating file {self.file_ops.get_hash_type()} hash inline...")
+                    fused_hasher = create_hasher()
+                else:
+                    def _hash_worker():
+                        try:
+                            hash_result["hash"], _ = self.file_ops.calculate_hash(input_file)
+                        except Exception as e:
+                            hash_result["error"] = e
+
+                    self.logger.log_sequence("HASH", "START",
+                                             f"Calculating file {self.file_ops.get_hash_type()} hash...")
+                    hash_thread = threading.Thread(target=_hash_worker, daemon=True)
+                    hash_thread.start()
+
+            # Reusable buffers for the no-mmap path, handed out through a
+            # queue so concurrent workers never share one. The pool's
+            # total size is capped: one buffer per worker at the default
+            # chunk size would preallocate several GiB in exactly the
+            # situation where mmap already failed for lack of memory.
+            # Workers beyond the pool depth simply wait for a buffer.
+            buffer_pool = None
+            if source_map is None and file_size > 0:
+                buffer_size = min(chunk_size, file_size)
+                pool_depth = max(1, min(max_workers,
+                                        self._FALLBACK_POOL_BUDGET // buffer_size))
+                buffer_pool = queue.Queue(maxsize=pool_depth)
+                for _ in range(pool_depth):
+                    buffer_pool.put(bytearray(buffer_size))
+
+            # Create the output directory once; a stat per chunk adds up,
+            # especially on network filesystems. The joined prefix saves
+            # os.path.join's normalization work on every chunk path.
+            os.makedirs(output_dir, exist_ok=True)
+            output_prefix = os.path.join(output_dir, '')
+
+            # Bind per-iteration lookups once; these names are the hot path
+            chunks_map = inventory["chunks"]
+            process_one_chunk = self._process_one_chunk
+            update_inventory = self._update_inventory
+            maybe_flush_inventory = self._maybe_flush_inventory
+            log_chunk_operation = self.logger.log_chunk_operation
+            advise_dontneed = self.file_ops.advise_dontneed
+
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                submit = pool.submit
+
+                def _submit(chunk_num):
+                    # The inventory entry already stores each chunk's id
+                    # and boundaries; reading them back guarantees the
+                    # filesystem, inventory and copy all agree, and skips
+                    # re-deriving anything per chunk
+                    entry = chunks_map[str(chunk_num)]
+                    chunk_id = entry["chunk_id"]
+                    output_path = output_prefix + chunk_id
+                    start_pos = entry["offset"]
+                    end_pos = start_pos + entry["expected_size"]
+                    future = submit(process_one_chunk, src_fd,
+                                    source_map, buffer_pool,
+                                    start_pos, end_pos, output_path)
+                    return chunk_num, chunk_id, output_path, start_pos, future
+
+                # Keep a bounded window of chunks in flight and drain results
+                # in submission order, so inventory updates, logging and
+                # progress output stay sequential while read/hash/write for
+                # neighbouring chunks overlap.
+                task_iter = iter(chunks_to_process)
+                in_flight = deque()
+                # One wall-clock read per checkpoint batch; chunks within a
+                # batch share the timestamp string
+                batch_iso = datetime.now().isoformat()
+                # Progress is repainted at most ~10x per second; a flushed
+                # stdout write per chunk is measurable on small chunks
+                last_print = 0.0
+                for chunk_num in itertools.islice(task_iter, max_workers * 2):
+                    in_flight.append(_submit(chunk_num))
+
+                while in_flight:
+                    chunk_num, chunk_id, output_path, start_pos, future = in_flight.popleft()
+                    duration_ns, chunk_size_actual, chunk_hash = future.result()
+
+                    # Drain order is chunk order, so the whole-file hash can
+                    # stream the same range the worker just touched
+                    if fused_hasher is not None:
+                        hashed_view = memoryview(source_map)[start_pos:start_pos + chunk_size_actual]
+                        fused_hasher.update(hashed_view)
+                        hashed_view.release()
+
+                    # Show progress (rate-limited; the final state is
+                    # repainted after the loop)
+                    now = time.monotonic()
+                    if now - last_print > 0.1:
+                        last_print = now
+                        progress = (chunk_num/total_chunks*100) if not specific_chunk else 100
+                        print(f"\rProcessing chunk {chunk_num}/{total_chunks} "
+                              f"({progress:.1f}%) - {chunk_id}", end="", flush=True)
+
+                    chunk_info = {
+                        "size": chunk_size_actual,
+                        "hash": chunk_hash,
+                        "processing_time": duration_ns / 1_000_000_000
+                    }
+
+                    # Update inventory
+                    inventory = update_inventory(inventory, chunk_num,
+                                                 chunk_info, batch_iso)
+
+                    # Checkpoint the inventory (batched)
+                    if maybe_flush_inventory(inventory, inventory_path):
+                        batch_iso = datetime.now().isoformat()
+
+                    log_chunk_operation(
+                        chunk_id=chunk_id,
+                        status="completed",
+                        duration_ns=duration_ns,
+                        size=chunk_size_actual,
+                        chunk_hash=chunk_hash,
+                        output_path=output_path,
+                        offset=start_pos
+                    )
+
+                    # This range of the source has been hashed and copied;
+                    # release its pages so the cache footprint stays flat
+                    advise_dontneed(src_fd, start_pos, chunk_size_actual)
+
+                    # Top the window back up
+                    for next_num in itertools.islice(task_iter, 1):
+                        in_flight.append(_submit(next_num))
+
+                # Make sure the last chunk's state is what stays on screen
+                if chunks_to_process:
+                    progress = (chunk_num/total_chunks*100) if not specific_chunk else 100
+                    print(f"\rProcessing chunk {chunk_num}/{total_chunks} "
+                          f"({progress:.1f}%) - {chunk_id}", end="", flush=True)
+
+        finally:
+            # Persist whatever completed before releasing resources, so an
+            # interrupted run can resume from the last processed chunk
+            self._maybe_flush_inventory(inventory, inventory_path, force=True)
+
+            # Ensure we always release the mapping and close the input file
+            if source_map is not None:
+                source_map.close()
+            if src_fd >= 0:
+                os.close(src_fd)
+
+        print("\n")  # New line after progress
+
+        # Collect the whole-file hash computed alongside the chunk loop
+        if need_file_hash:
+            if fused_hasher is not None:
+                inventory["original_hash"] = fused_hasher.hexdigest()
+            else:
+                hash_thread.join()
+                if "error" in hash_result:
+                    raise hash_result["error"]
+                inventory["original_hash"] = hash_result["hash"]
+            inventory["last_updated"] = datetime.now().isoformat()
+            self.logger.log_sequence("HASH", "COMPLETE", f"Hash: {inventory['original_hash'][:16]}...")
+            InventoryManager.write_inventory(inventory, inventory_path)
+        
+        # Once every chunk is hashed, record a commitment over the
+        # chunk-hash list so a reconstruction that verified each chunk
+        # can skip re-hashing the whole rebuilt file
+        if inventory["chunk_status"]["chunks_remaining"] == 0:
+            chunk_digest = InventoryManager.compute_chunk_digest(inventory)
+            if chunk_digest:
+                inventory["chunk_hashes_digest"] = chunk_digest
+
+        # Print summary
+        print(f"\nChunking Status:")
+        print(f"Processed: {inventory['chunk_status']['total_processed']}/{total_chunks}")
+        print(f"Remaining: {inventory['chunk_status']['chunks_remaining']}")
+        
         return inventory
\ No newline at end of file
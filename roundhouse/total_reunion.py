@@ -1,307 +1,636 @@
-# File: total_reunion.py
-
-import os
-import json
-import sys
-from datetime import datetime
-from typing import Optional, List, Tuple, Dict
-from roundhouse.dojo_handlers import create_hasher, hash_data
-
-class FileReconstructor:
-    """Handles file reconstruction from chunks."""
-
-    def __init__(self, inventory_path: str, output_dir: Optional[str] = None, validate: bool = True):
-        """Initialize the FileReconstructor.
-        
-        Args:
-            inventory_path (str): Path to the inventory JSON file
-            output_dir (Optional[str], optional): Directory for reconstructed file. Defaults to None.
-            validate (bool, optional): Whether to validate chunks during reconstruction. Defaults to True.
-            
-        Raises:
-            ValueError: If output directory is invalid or inventory can't be loaded
-        """
-        self.inventory_path = inventory_path
-        self.validate = validate
-        self.inventory = self._load_inventory()
-        self.chunks_dir = os.path.dirname(inventory_path)
-        
-        if output_dir:
-            os.makedirs(output_dir, exist_ok=True)
-            if not os.path.isdir(output_dir):
-                raise ValueError(f"Output path must be a directory: {output_dir}")
-            self.output_file = os.path.join(output_dir, self.inventory['original_filename'])
-        else:
-            self.output_file = os.path.join(os.getcwd(), self.inventory['original_filename'])
-
-    def _load_inventory(self) -> Dict:
-        """Load and validate inventory file.
-        
-        Returns:
-            Dict: Loaded inventory data
-            
-        Raises:
-            ValueError: If inventory file can't be loaded or is invalid
-        """
-        try:
-            with open(self.inventory_path, 'r') as f:
-                inventory = json.load(f)
-                
-            # Validate required fields
-            required_fields = ['original_filename', 'original_size', 'original_hash', 
-                             'hash_type', 'chunks']
-            missing_fields = [field for field in required_fields if field not in inventory]
-            
-            if missing_fields:
-                raise ValueError(f"Missing required fields in inventory: {', '.join(missing_fields)}")
-                
-            return inventory
-        except Exception as e:
-            raise ValueError(f"Failed to load inventory: {str(e)}")
-
-    def _validate_chunks_presence(self) -> Tuple[bool, List[str], List[str]]:
-        """Validate that all required chunk files are present.
-        
-        Returns:
-            Tuple[bool, List[str], List[str]]: (is_valid, missing_chunks, found_chunks)
-        """
-        required_chunks = {}
-        for chunk_num, chunk_info in self.inventory['chunks'].items():
-            # Skip chunks that aren't marked as completed
-            if chunk_info['status'] != 'completed':
-                continue
-            required_chunks[chunk_info['chunk_id']] = chunk_info
-            
-        missing_chunks = []
-        found_chunks = []
-        
-        # Check each required chunk
-        for chunk_id, chunk_info in required_chunks.items():
-            chunk_path = os.path.join(self.chunks_dir, chunk_id)
-            if os.path.exists(chunk_path):
-                # Verify file size if available
-                if 'size' in chunk_info:
-                    actual_size = os.path.getsize(chunk_path)
-                    if actual_size != chunk_info['size']:
-                        missing_chunks.append(f"{chunk_id} (size mismatch: expected {chunk_info['size']}, got {actual_size})")
-                        continue
-                found_chunks.append(chunk_id)
-            else:
-                missing_chunks.append(chunk_id)
-        
-        return len(missing_chunks) == 0, missing_chunks, found_chunks
-
-    def _print_chunk_status(self, missing_chunks: List[str], found_chunks: List[str]):
-        """Print detailed chunk status information."""
-        total_expected = sum(1 for chunk in self.inventory['chunks'].values() 
-                           if chunk['status'] == 'completed')
-        
-        print("\nChunk Files Status:")
-        print(f"Total chunks required: {self.inventory['total_chunks']}")
-        print(f"Completed chunks: {total_expected}")
-        print(f"Chunks found: {len(found_chunks)}")
-        print(f"Chunks missing: {len(missing_chunks)}")
-        
-        if missing_chunks:
-            print("\nMissing chunks:")
-            for chunk in sorted(missing_chunks):
-                print(f"  - {chunk}")
-        
-        print("\nFound chunks:")
-        for chunk in sorted(found_chunks):
-            print(f"  - {chunk}")
-
-    def _validate_chunk(self, chunk_data: bytes, chunk_info: Dict):
-        """Validate chunk data against stored hash.
-        
-        Args:
-            chunk_data (bytes): The chunk data to validate
-            chunk_info (Dict): Chunk information from inventory
-            
-        Raises:
-            ValueError: If chunk hash doesn't match expected hash
-        """
-        if not self.validate:
-            return
-        
-        if 'hash' not in chunk_info:
-            print(f"Warning: No hash found for chunk {chunk_info['chunk_id']}, skipping validation")
-            return
-            
-        chunk_hash = hash_data(chunk_data)
-        if chunk_hash != chunk_info['hash']:
-            raise ValueError(
-                f"Chunk hash mismatch for {chunk_info['chunk_id']}:\n"
-                f"Expected: {chunk_info['hash']}\n"
-                f"Got: {chunk_hash}"
-            )
-
-    def reconstruct(self) -> bool:
-        """Reconstruct file from chunks.
-        
-        Returns:
-            bool: True if reconstruction successful, False otherwise
-        """
-        try:
-            # Initial setup and validation
-            print(f"\nValidating chunk files...")
-            chunks_valid, missing_chunks, found_chunks = self._validate_chunks_presence()
-            self._print_chunk_status(missing_chunks, found_chunks)
-            
-            if not chunks_valid:
-                raise ValueError(
-                    f"Cannot proceed with reconstruction: {len(missing_chunks)} "
-                    "chunks missing or incomplete"
-                )
-            
-            # Setup for reconstruction
-            hash_type = self.inventory.get('hash_type', 'md5')
-            hasher = create_hasher() if self.validate else None
-            reconstructed_size = 0
-            
-            # Print reconstruction info
-            print(f"\nReconstructing file: {self.output_file}")
-            print(f"Using inventory: {self.inventory_path}")
-            print(f"Expected file size: {self.inventory['original_size']:,} bytes")
-            print(f"Total chunks: {self.inventory['total_chunks']}")
-            print(f"Hash type: {hash_type}")
-            print(f"Validation: {'enabled' if self.validate else 'disabled'}")
-            
-            # Check if output file already exists
-            if os.path.exists(self.output_file):
-                raise ValueError(f"Output file already exists: {self.output_file}")
-            
-            # Sort chunks by number for ordered reconstruction
-            sorted_chunks = sorted(
-                [(int(k), v) for k, v in self.inventory['chunks'].items()
-                 if v['status'] == 'completed'],
-                key=lambda x: x[0]
-            )
-            
-            # Create directory for output file if it doesn't exist
-            os.makedirs(os.path.dirname(os.path.abspath(self.output_file)), exist_ok=True)
-            
-            # Reconstruct file
-            with open(self.output_file, 'wb') as outfile:
-                for chunk_num, chunk_info in sorted_chunks:
-                    current_percentage = (chunk_num / self.inventory['total_chunks']) * 100
-                    print(f"\rProcessing chunk {chunk_num}/{self.inventory['total_chunks']} "
-                          f"({current_percentage:.1f}%) - {chunk_info['chunk_id']}", 
-                          end="", flush=True)
-                    
-                    chunk_path = os.path.join(self.chunks_dir, chunk_info['chunk_id'])
-                    
-                    # Read and validate chunk
-                    with open(chunk_path, 'rb') as chunk_file:
-                        chunk_data = chunk_file.read()
-                        self._validate_chunk(chunk_data, chunk_info)
-                        
-                        # Write chunk to output file
-                        outfile.write(chunk_data)
-                        reconstructed_size += len(chunk_data)
-                        
-                        # Update file hash if validating
-                        if self.validate:
-                            hasher.update(chunk_data)
-            
-            print("\n\nReconstruction complete!")
-            print(f"Written to: {self.output_file}")
-            print(f"Final size: {reconstructed_size:,} bytes")
-            
-            # Validate final size
-            if reconstructed_size != self.inventory['original_size']:
-                raise ValueError(
-                    f"File size mismatch:\n"
-                    f"Expected: {self.inventory['original_size']:,} bytes\n"
-                    f"Got:      {reconstructed_size:,} bytes"
-                )
-            
-            # Validate final hash
-            if self.validate:
-                final_hash = hasher.hexdigest()
-                if final_hash != self.inventory['original_hash']:
-                    raise ValueError(
-                        f"File hash mismatch:\n"
-                        f"Expected: {self.inventory['original_hash']}\n"
-                        f"Got:      {final_hash}"
-                    )
-                print(f"Hash verification: PASSED")
-            
-            return True
-            
-        except Exception as e:
-            print(f"\nError during reconstruction: {str(e)}", file=sys.stderr)
-            if os.path.exists(self.output_file):
-                os.remove(self.output_file)
-                print(f"Removed incomplete file: {self.output_file}")
-            return False
-
-class ReconstructionManager:
-    """Manages the overall reconstruction process including inventory verification."""
-    
-    def __init__(self, inventory_path: str):
-        """Initialize ReconstructionManager.
-        
-        Args:
-            inventory_path (str): Path to the inventory file
-        """
-        self.inventory_path = inventory_path
-        
-    def verify_reconstruction_readiness(self) -> Tuple[bool, List[str]]:
-        """Verify if all necessary components are ready for reconstruction.
-        
-        Returns:
-            Tuple[bool, List[str]]: (is_ready, list_of_issues)
-        """
-        issues = []
-        
-        # Check inventory file
-        if not os.path.exists(self.inventory_path):
-            issues.append(f"Inventory file not found: {self.inventory_path}")
-            return False, issues
-            
-        try:
-            with open(self.inventory_path, 'r') as f:
-                inventory = json.load(f)
-        except Exception as e:
-            issues.append(f"Failed to load inventory: {str(e)}")
-            return False, issues
-            
-        # Check required fields
-        required_fields = ['original_filename', 'original_size', 'original_hash', 
-                          'chunks', 'total_chunks']
-        for field in required_fields:
-            if field not in inventory:
-                issues.append(f"Missing required field in inventory: {field}")
-        
-        # Check chunks
-        chunks_dir = os.path.dirname(self.inventory_path)
-        incomplete_chunks = []
-        missing_chunks = []
-        
-        for chunk_num, chunk_info in inventory.get('chunks', {}).items():
-            if chunk_info['status'] != 'completed':
-                incomplete_chunks.append(chunk_info['chunk_id'])
-            else:
-                chunk_path = os.path.join(chunks_dir, chunk_info['chunk_id'])
-                if not os.path.exists(chunk_path):
-                    missing_chunks.append(chunk_info['chunk_id'])
-        
-        if incomplete_chunks:
-            issues.append(f"Found {len(incomplete_chunks)} incomplete chunks")
-        if missing_chunks:
-            issues.append(f"Found {len(missing_chunks)} missing chunk files")
-            
-        return len(issues) == 0, issues
-    
-    def print_reconstruction_status(self):
-        """Print current status of reconstruction readiness."""
-        print("\nChecking reconstruction readiness...")
-        ready, issues = self.verify_reconstruction_readiness()
-        
-        if ready:
-            print("✓ All checks passed - ready for reconstruction")
-        else:
-            print("✗ Issues found preventing reconstruction:")
-            for issue in issues:
+# File: total_reunion.py
+
+import os
+import sys
+import mmap
+import time
+import zlib
+import shutil
+import itertools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Optional, List, Tuple, Dict
+from roundhouse.dojo_handlers import FileOperations, InventoryManager, hash_digest_for, _loads
+
+class FileReconstructor:
+    """Handles file reconstruction from chunks."""
+
+    def __init__(self, inventory_path: str, output_dir: Optional[str] = None, validate="full"):
+        """Initialize the FileReconstructor.
+
+        Args:
+            inventory_path (str): Path to the inventory JSON file
+            output_dir (Optional[str], optional): Directory for reconstructed file. Defaults to None.
+            validate (optional): Validation mode - 'full' hashes every
+                chunk, 'sample' hashes a deterministic subset (always
+                including the first and last chunk) plus the final whole
+                file, 'none' skips hashing entirely. The bools True and
+                False are accepted as aliases for 'full' and 'none'.
+                Defaults to 'full'.
+
+        Raises:
+            ValueError: If output directory is invalid, the validate mode
+                is unknown, or inventory can't be loaded
+        """
+        self.inventory_path = inventory_path
+        if validate is True:
+            validate = 'full'
+        elif validate is False:
+            validate = 'none'
+        if validate not in ('full', 'sample', 'none'):
+            raise ValueError(f"Unknown validation mode: {validate}")
+        self.validate_mode = validate
+        self.validate = validate != 'none'
+        self.inventory = self._load_inventory()
+        self.chunks_dir = os.path.dirname(inventory_path)
+
+        # Completed chunks in reconstruction order, computed once; every
+        # pass (presence check, status print, reconstruction) walks this
+        # list instead of re-filtering and re-sorting the chunk map.
+        # Probing sequential str keys skips the int() parse per key and
+        # yields the list already ordered, so no sort is needed.
+        chunks = self.inventory['chunks']
+        self._completed = []
+        for chunk_num in range(1, self.inventory['total_chunks'] + 1):
+            chunk_info = chunks.get(str(chunk_num))
+            if chunk_info and chunk_info['status'] == 'completed':
+                self._completed.append((chunk_num, chunk_info))
+
+        # Decode expected chunk hashes once; the validation loop compares
+        # raw digests instead of building a hex string per chunk
+        if self.validate:
+            for _, chunk_info in self._completed:
+                if 'hash' in chunk_info:
+                    chunk_info['hash_bytes'] = bytes.fromhex(chunk_info['hash'])
+        
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+            if not os.path.isdir(output_dir):
+                raise ValueError(f"Output path must be a directory: {output_dir}")
+            self.output_file = os.path.join(output_dir, self.inventory['original_filename'])
+        else:
+            self.output_file = os.path.join(os.getcwd(), self.inventory['original_filename'])
+
+    def _load_inventory(self) -> Dict:
+        """Load and validate inventory file.
+        
+        Returns:
+            Dict: Loaded inventory data
+            
+        Raises:
+            ValueError: If inventory file can't be loaded or is invalid
+        """
+        try:
+            with open(self.inventory_path, 'rb') as f:
+                inventory = _loads(f.read())
+
+            # Validate required fields
+            required_fields = ['original_filename', 'original_size', 'original_hash', 
+                             'hash_type', 'chunks']
+            missing_fields = [field for field in required_fields if field not in inventory]
+            
+            if missing_fields:
+                raise ValueError(f"Missing required fields in inventory: {', '.join(missing_fields)}")
+                
+            return inventory
+        except Exception as e:
+            raise ValueError(f"Failed to load inventory: {str(e)}")
+
+    def _validate_chunks_presence(self) -> Tuple[bool, List[str], List[str]]:
+        """Validate that all required chunk files are present.
+        
+        Returns:
+            Tuple[bool, List[str], List[str]]: (is_valid, missing_chunks, found_chunks)
+        """
+        missing_chunks = []
+        found_chunks = []
+
+        # One directory scan replaces an exists+getsize stat pair per
+        # chunk; scandir entries carry the size from the same readdir
+        sizes_on_disk = {}
+        with os.scandir(self.chunks_dir) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    sizes_on_disk[entry.name] = entry.stat().st_size
+
+        # Check each required chunk
+        for chunk_num, chunk_info in self._completed:
+            chunk_id = chunk_info['chunk_id']
+            actual_size = sizes_on_disk.get(chunk_id)
+            if actual_size is None:
+                missing_chunks.append(chunk_id)
+            elif 'size' in chunk_info and actual_size != chunk_info['size']:
+                missing_chunks.append(f"{chunk_id} (size mismatch: expected {chunk_info['size']}, got {actual_size})")
+            else:
+                found_chunks.append(chunk_id)
+
+        return len(missing_chunks) == 0, missing_chunks, found_chunks
+
+    # Chunk listings longer than this are summarized rather than printed
+    # in full
+    _STATUS_LIST_LIMIT = 20
+
+    def _print_chunk_status(self, missing_chunks: List[str], found_chunks: List[str]):
+        """Print detailed chunk status information."""
+        total_expected = len(self._completed)
+        limit = self._STATUS_LIST_LIMIT
+
+        lines = [
+            "\nChunk Files Status:",
+            f"Total chunks required: {self.inventory['total_chunks']}",
+            f"Completed chunks: {total_expected}",
+            f"Chunks found: {len(found_chunks)}",
+            f"Chunks missing: {len(missing_chunks)}",
+        ]
+
+        if missing_chunks:
+            missing_chunks.sort()
+            lines.append("\nMissing chunks:")
+            lines.extend(f"  - {chunk}" for chunk in missing_chunks[:limit])
+            if len(missing_chunks) > limit:
+                lines.append(f"  ... and {len(missing_chunks) - limit} more")
+
+        found_chunks.sort()
+        lines.append("\nFound chunks:")
+        lines.extend(f"  - {chunk}" for chunk in found_chunks[:limit])
+        if len(found_chunks) > limit:
+            lines.append(f"  ... and {len(found_chunks) - limit} more")
+
+        # One write instead of a syscall per listed chunk
+        print("\n".join(lines))
+
+    # In sample mode roughly 1 in this many chunks is hash-checked
+    _SAMPLE_MODULUS = 20
+
+    def _should_sample(self, chunk_num: int) -> bool:
+        """Decide whether a chunk is hash-checked in sample mode.
+
+        The first and last chunks are always checked (truncation and
+        header corruption land there most often); the rest are selected
+        by a stable digest of the chunk number, so repeated runs over the
+        same inventory sample the same subset. hash() is salted per
+        process and would not be reproducible.
+
+        Args:
+            chunk_num (int): 1-based chunk number
+
+        Returns:
+            bool: True if the chunk's hash should be verified
+        """
+        if chunk_num == 1 or chunk_num == self.inventory['total_chunks']:
+            return True
+        return zlib.crc32(str(chunk_num).encode()) % self._SAMPLE_MODULUS == 0
+
+    def _validate_chunk(self, chunk_digest: Optional[bytes], chunk_info: Dict):
+        """Validate a computed chunk digest against the stored hash.
+
+        Args:
+            chunk_digest (Optional[bytes]): Raw digest of the chunk data,
+                computed by the reader worker alongside the read; None
+                means the chunk was not hashed (validation off, or an
+                unsampled chunk in sample mode)
+            chunk_info (Dict): Chunk information from inventory
+
+        Raises:
+            ValueError: If chunk hash doesn't match expected hash
+        """
+        if chunk_digest is None:
+            return
+
+        if 'hash_bytes' not in chunk_info:
+            print(f"Warning: No hash found for chunk {chunk_info['chunk_id']}, skipping validation")
+            return
+
+        if chunk_digest != chunk_info['hash_bytes']:
+            raise ValueError(
+                f"Chunk hash mismatch for {chunk_info['chunk_id']}:\n"
+                f"Expected: {chunk_info['hash']}\n"
+                f"Got: {chunk_digest.hex()}"
+            )
+
+    # Bytes prefetched by the warm-up when free memory can't be probed
+    _WARM_CACHE_FALLBACK_BUDGET = 2 * 1024 ** 3
+
+    def _warm_page_cache(self, sorted_chunks: List[Tuple[int, Dict]]):
+        """Prefetch chunk files into the page cache before reconstruction.
+
+        A WILLNEED fadvise on every chunk up front lets the kernel fetch
+        them from storage concurrently with the loop below; without it
+        the loop pays each chunk's first-read latency serially. The hint
+        queues readahead and returns immediately, and the pages stay
+        cached on the inode after the descriptor closes, so a plain
+        serial sweep suffices. Prefetching stops once roughly half the
+        currently free memory has been queued, so the warm-up can't
+        evict pages the reconstruction itself needs. No-op where
+        posix_fadvise is unavailable (e.g. Windows).
+
+        Args:
+            sorted_chunks (List[Tuple[int, Dict]]): (number, info) pairs
+                in chunk order
+        """
+        if not hasattr(os, 'posix_fadvise'):
+            return
+
+        budget = self._WARM_CACHE_FALLBACK_BUDGET
+        try:
+            budget = (os.sysconf('SC_PAGE_SIZE')
+                      * os.sysconf('SC_AVPHYS_PAGES')) // 2
+        except (AttributeError, ValueError, OSError):
+            pass
+
+        chunk_prefix = os.path.join(self.chunks_dir, '')
+        queued = 0
+        for chunk_num, chunk_info in sorted_chunks:
+            size = chunk_info.get('size', 0)
+            if queued + size > budget:
+                break
+            queued += size
+            try:
+                fd = os.open(chunk_prefix + chunk_info['chunk_id'],
+                             os.O_RDONLY)
+            except OSError:
+                # A missing chunk is reported properly by the loop below
+                continue
+            try:
+                FileOperations.advise_willneed(fd, 0, size)
+            finally:
+                os.close(fd)
+
+    def _copy_chunks(self, outfile, sorted_chunks: List[Tuple[int, Dict]],
+                     total_chunks: int) -> int:
+        """Concatenate chunk files into the output without validation.
+
+        With validation off the chunk bytes are never needed in
+        userspace, so each chunk is moved inside the kernel
+        (copy_file_range/sendfile) where supported, falling back to a
+        buffered copy.
+
+        Args:
+            outfile: Open binary output file object
+            sorted_chunks (List[Tuple[int, Dict]]): (number, info) pairs
+                in chunk order
+            total_chunks (int): Total chunk count, for progress output
+
+        Returns:
+            int: Total bytes written
+        """
+        reconstructed_size = 0
+        out_fd = outfile.fileno()
+        last_print = 0.0
+        # Joined prefix saves os.path.join's normalization work per chunk
+        chunk_prefix = os.path.join(self.chunks_dir, '')
+        for chunk_num, chunk_info in sorted_chunks:
+            now = time.monotonic()
+            if now - last_print > 0.1:
+                last_print = now
+                current_percentage = (chunk_num / total_chunks) * 100
+                print(f"\rProcessing chunk {chunk_num}/{total_chunks} "
+                      f"({current_percentage:.1f}%) - {chunk_info['chunk_id']}",
+                      end="", flush=True)
+
+            chunk_path = chunk_prefix + chunk_info['chunk_id']
+            with open(chunk_path, 'rb') as chunk_file:
+                chunk_fd = chunk_file.fileno()
+                FileOperations.advise_sequential(chunk_fd)
+                size = os.fstat(chunk_fd).st_size
+                if not FileOperations.copy_into(chunk_fd, out_fd, size,
+                                                reconstructed_size):
+                    chunk_file.seek(0)
+                    outfile.seek(reconstructed_size)
+                    shutil.copyfileobj(chunk_file, outfile, 1024 * 1024)
+                    outfile.flush()
+                FileOperations.advise_dontneed(chunk_fd)
+            reconstructed_size += size
+        FileOperations.advise_dontneed(out_fd)
+        if sorted_chunks:
+            current_percentage = (chunk_num / total_chunks) * 100
+            print(f"\rProcessing chunk {chunk_num}/{total_chunks} "
+                  f"({current_percentage:.1f}%) - {chunk_info['chunk_id']}",
+                  end="", flush=True)
+        return reconstructed_size
+
+    def _finish_reconstruction(self, reconstructed_size: int, hash_type: str,
+                               chunks_committed: bool = False) -> bool:
+        """Verify the finished output's size and hash and report success.
+
+        The whole-file hash is computed in one pass over the finished
+        output rather than streamed chunk-by-chunk during the write loop:
+        calculate_hash runs with an optimally sized buffer (or a single
+        one-shot over an mmap), which beats feeding the hasher whatever
+        chunk sizes the producer happened to choose. When every chunk was
+        individually verified and the chunk-hash list matches the
+        commitment recorded at chunking time, even that pass is skipped.
+
+        Args:
+            reconstructed_size (int): Total bytes written
+            hash_type (str): Backend tag recorded in the inventory
+            chunks_committed (bool): True when per-chunk validation plus
+                the inventory's chunk_hashes_digest already prove the
+                output's content
+
+        Returns:
+            bool: True on success
+
+        Raises:
+            ValueError: If the final size or hash doesn't match the inventory
+        """
+        print("\n\nReconstruction complete!")
+        print(f"Written to: {self.output_file}")
+        print(f"Final size: {reconstructed_size:,} bytes")
+
+        # Validate final size
+        if reconstructed_size != self.inventory['original_size']:
+            raise ValueError(
+                f"File size mismatch:\n"
+                f"Expected: {self.inventory['original_size']:,} bytes\n"
+                f"Got:      {reconstructed_size:,} bytes"
+            )
+
+        # Validate final hash
+        if self.validate:
+            if chunks_committed:
+                print(f"Hash verification: PASSED (chunk hashes match recorded commitment)")
+                return True
+            final_hash, _ = FileOperations.calculate_hash(
+                self.output_file, hash_type=hash_type)
+            if final_hash != self.inventory['original_hash']:
+                raise ValueError(
+                    f"File hash mismatch:\n"
+                    f"Expected: {self.inventory['original_hash']}\n"
+                    f"Got:      {final_hash}"
+                )
+            print(f"Hash verification: PASSED")
+
+        return True
+
+    def reconstruct(self) -> bool:
+        """Reconstruct file from chunks.
+
+        Returns:
+            bool: True if reconstruction successful, False otherwise
+        """
+        try:
+            # Initial setup and validation
+            print(f"\nValidating chunk files...")
+            chunks_valid, missing_chunks, found_chunks = self._validate_chunks_presence()
+            self._print_chunk_status(missing_chunks, found_chunks)
+            
+            if not chunks_valid:
+                raise ValueError(
+                    f"Cannot proceed with reconstruction: {len(missing_chunks)} "
+                    "chunks missing or incomplete"
+                )
+            
+            # Setup for reconstruction; verify with the backend the
+            # inventory was written with, which may differ from this
+            # machine's default
+            hash_type = self.inventory.get('hash_type', 'md5')
+            reconstructed_size = 0
+            
+            # Print reconstruction info
+            print(f"\nReconstructing file: {self.output_file}")
+            print(f"Using inventory: {self.inventory_path}")
+            print(f"Expected file size: {self.inventory['original_size']:,} bytes")
+            print(f"Total chunks: {self.inventory['total_chunks']}")
+            print(f"Hash type: {hash_type}")
+            validation_desc = {
+                'full': 'enabled',
+                'sample': f'sampled (~1 in {self._SAMPLE_MODULUS} chunks, '
+                          'plus final whole-file hash)',
+                'none': 'disabled',
+            }[self.validate_mode]
+            print(f"Validation: {validation_desc}")
+            
+            # Check if output file already exists
+            if os.path.exists(self.output_file):
+                raise ValueError(f"Output file already exists: {self.output_file}")
+            
+            # Completed chunks were sorted by number once at init
+            sorted_chunks = self._completed
+            
+            # Create directory for output file if it doesn't exist
+            os.makedirs(os.path.dirname(os.path.abspath(self.output_file)), exist_ok=True)
+
+            # Pull chunk pages into RAM ahead of the loop so the reads
+            # below hit the cache instead of paying storage latency one
+            # chunk at a time
+            self._warm_page_cache(sorted_chunks)
+
+            total_chunks = self.inventory['total_chunks']
+            validate = self.validate
+            full_validation = self.validate_mode == 'full'
+            should_sample = self._should_sample
+            # Joined prefix saves os.path.join's normalization work on
+            # every chunk path
+            chunk_prefix = os.path.join(self.chunks_dir, '')
+            max_workers = min(8, os.cpu_count() or 1)
+
+            def _load_chunk(chunk_num, chunk_info):
+                """Map one chunk and hash it (runs on a worker thread).
+
+                Mapping instead of read() keeps the chunk bytes in the
+                page cache - the hash and the output write consume the
+                mapping directly, so nothing is copied into a Python
+                bytes object first. The hash releases the GIL, so
+                validation for neighbouring chunks overlaps while the
+                main thread writes earlier chunks.
+
+                Returns:
+                    Tuple of (open file or None, mmap-or-bytes, hash);
+                    the caller closes the mapping after writing it.
+                """
+                chunk_path = chunk_prefix + chunk_info['chunk_id']
+                chunk_file = open(chunk_path, 'rb')
+                FileOperations.advise_sequential(chunk_file.fileno())
+                try:
+                    chunk_data = mmap.mmap(chunk_file.fileno(), 0,
+                                           access=mmap.ACCESS_READ)
+                    if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                        chunk_data.madvise(mmap.MADV_SEQUENTIAL)
+                except (OSError, ValueError):
+                    # Empty or unmappable chunk - fall back to a plain read
+                    chunk_data = chunk_file.read()
+                    chunk_file.close()
+                    chunk_file = None
+                do_hash = full_validation or should_sample(chunk_num)
+                chunk_digest = hash_digest_for(hash_type, chunk_data) if do_hash else None
+                return chunk_file, chunk_data, chunk_digest
+
+            if not validate:
+                # No hashing to feed - the bytes can stay in the kernel
+                with open(self.output_file, 'wb', buffering=0) as outfile:
+                    FileOperations.preallocate(outfile.fileno(),
+                                               self.inventory['original_size'])
+                    reconstructed_size = self._copy_chunks(
+                        outfile, sorted_chunks, total_chunks)
+                return self._finish_reconstruction(reconstructed_size, hash_type)
+
+            # Reconstruct file: a bounded window of reader workers runs
+            # ahead of the writer; results are drained in chunk order so
+            # the output bytes and the global hash stay sequential
+            # Unbuffered handle: chunks are whole megabytes, so the
+            # BufferedWriter layer would only re-copy them into its own
+            # buffer before the same write syscall
+            with open(self.output_file, 'wb', buffering=0) as outfile, \
+                    ThreadPoolExecutor(max_workers=max_workers) as pool:
+                # Reserve the final size up front: one extent allocation
+                # instead of growing the file chunk by chunk, and ENOSPC
+                # surfaces before any bytes move
+                FileOperations.preallocate(outfile.fileno(),
+                                           self.inventory['original_size'])
+                chunk_iter = iter(sorted_chunks)
+                in_flight = deque()
+                written_since_drop = 0
+                # Progress is repainted at most ~10x per second; a flushed
+                # stdout write per chunk serializes the pipeline
+                last_print = 0.0
+                for chunk_num, chunk_info in itertools.islice(chunk_iter, max_workers * 2):
+                    in_flight.append((chunk_num, chunk_info,
+                                      pool.submit(_load_chunk, chunk_num, chunk_info)))
+
+                while in_flight:
+                    chunk_num, chunk_info, future = in_flight.popleft()
+                    chunk_file, chunk_data, chunk_digest = future.result()
+
+                    now = time.monotonic()
+                    if now - last_print > 0.1:
+                        last_print = now
+                        current_percentage = (chunk_num / total_chunks) * 100
+                        print(f"\rProcessing chunk {chunk_num}/{total_chunks} "
+                              f"({current_percentage:.1f}%) - {chunk_info['chunk_id']}",
+                              end="", flush=True)
+
+                    try:
+                        self._validate_chunk(chunk_digest, chunk_info)
+
+                        # Write chunk to output file; the raw handle can
+                        # return a short write, so top it up if needed
+                        length = len(chunk_data)
+                        written = outfile.write(chunk_data)
+                        while written < length:
+                            written += outfile.write(
+                                memoryview(chunk_data)[written:])
+                        reconstructed_size += length
+                    finally:
+                        if chunk_file is not None:
+                            chunk_data.close()
+                            # This chunk's pages have been hashed and
+                            # copied out - let the kernel reclaim them
+                            FileOperations.advise_dontneed(chunk_file.fileno())
+                            chunk_file.close()
+
+                    # Periodically hint that written ranges won't be
+                    # reread. The handle is unbuffered so there is
+                    # nothing to flush, and DONTNEED is best-effort on
+                    # pages still awaiting writeback - but repeating the
+                    # hint keeps the clean portion of the output from
+                    # accumulating in the cache on multi-GB files
+                    written_since_drop += 1
+                    if written_since_drop >= 16:
+                        written_since_drop = 0
+                        FileOperations.advise_dontneed(outfile.fileno())
+
+                    # Top the read window back up
+                    for next_num, next_info in itertools.islice(chunk_iter, 1):
+                        in_flight.append((next_num, next_info,
+                                          pool.submit(_load_chunk, next_num, next_info)))
+
+                # Make sure the last chunk's state is what stays on screen
+                if sorted_chunks:
+                    current_percentage = (chunk_num / total_chunks) * 100
+                    print(f"\rProcessing chunk {chunk_num}/{total_chunks} "
+                          f"({current_percentage:.1f}%) - {chunk_info['chunk_id']}",
+                          end="", flush=True)
+            
+            # Every chunk was just verified against its recorded hash; if
+            # the inventory carries a commitment over the chunk-hash list,
+            # checking it replaces the O(file_size) final re-hash. The
+            # shortcut only proves the output's content when every chunk's
+            # data was actually hashed, so sample mode always falls
+            # through to the full re-hash
+            chunks_committed = False
+            expected_digest = self.inventory.get('chunk_hashes_digest')
+            if expected_digest and full_validation:
+                chunks_committed = (
+                    InventoryManager.compute_chunk_digest(self.inventory)
+                    == expected_digest)
+
+            return self._finish_reconstruction(reconstructed_size, hash_type,
+                                               chunks_committed)
+
+        except Exception as e:
+            print(f"\nError during reconstruction: {str(e)}", file=sys.stderr)
+            if os.path.exists(self.output_file):
+                os.remove(self.output_file)
+                print(f"Removed incomplete file: {self.output_file}")
+            return False
+
+class ReconstructionManager:
+    """Manages the overall reconstruction process including inventory verification."""
+    
+    def __init__(self, inventory_path: str):
+        """Initialize ReconstructionManager.
+        
+        Args:
+            inventory_path (str): Path to the inventory file
+        """
+        self.inventory_path = inventory_path
+        
+    def verify_reconstruction_readiness(self) -> Tuple[bool, List[str]]:
+        """Verify if all necessary components are ready for reconstruction.
+        
+        Returns:
+            Tuple[bool, List[str]]: (is_ready, list_of_issues)
+        """
+        issues = []
+        
+        # Check inventory file
+        if not os.path.exists(self.inventory_path):
+            issues.append(f"Inventory file not found: {self.inventory_path}")
+            return False, issues
+            
+        try:
+            with open(self.inventory_path, 'rb') as f:
+                inventory = _loads(f.read())
+        except Exception as e:
+            issues.append(f"Failed to load inventory: {str(e)}")
+            return False, issues
+            
+        # Check required fields
+        required_fields = ['original_filename', 'original_size', 'original_hash', 
+                          'chunks', 'total_chunks']
+        for field in required_fields:
+            if field not in inventory:
+                issues.append(f"Missing required field in inventory: {field}")
+        
+        # Check chunks
+        chunk_prefix = os.path.join(os.path.dirname(self.inventory_path), '')
+        incomplete_chunks = []
+        missing_chunks = []
+
+        for chunk_num, chunk_info in inventory.get('chunks', {}).items():
+            if chunk_info['status'] != 'completed':
+                incomplete_chunks.append(chunk_info['chunk_id'])
+            else:
+                if not os.path.exists(chunk_prefix + chunk_info['chunk_id']):
+                    missing_chunks.append(chunk_info['chunk_id'])
+        
+        if incomplete_chunks:
+            issues.append(f"Found {len(incomplete_chunks)} incomplete chunks")
+        if missing_chunks:
+            issues.append(f"Found {len(missing_chunks)} missing chunk files")
+            
+        return len(issues) == 0, issues
+    
+    def print_reconstruction_status(self):
+        """Print current status of reconstruction readiness."""
+        print("\nChecking reconstruction readiness...")
+        ready, issues = self.verify_reconstruction_readiness()
+        
+        if ready:
+            print("✓ All checks passed - ready for reconstruction")
+        else:
+            print("✗ Issues found preventing reconstruction:")
+            for issue in issues:
                 print(f"  - {issue}")
\ No newline at end of file
@@ -1,38 +1,70 @@
-import hashlib
-import xxhash
-import time
-
-def hash_file(file_path, hasher, block_size=65536):
-    """Hash a large file in chunks using the provided hasher."""
-    with open(file_path, 'rb') as f:
-        while chunk := f.read(block_size):
-            hasher.update(chunk)
-
-    return hasher.hexdigest()
-
-def benchmark(file_path, algorithm='sha256', is_native=True):
-    """Benchmark the time taken to hash a file."""
-    print(f"\nBenchmarking {algorithm.upper()}...")
-    start_time = time.time()
-
-    if is_native:
-        hasher = hashlib.new(algorithm)
-    else:
-        hasher = xxhash.xxh64() if algorithm == 'xxh64' else xxhash.xxh3_128()
-
-    hash_value = hash_file(file_path, hasher)
-
-    elapsed_time = time.time() - start_time
-    print(f"{algorithm.upper()} Hash: {hash_value}")
-    print(f"Time Taken: {elapsed_time:.2f} seconds")
-
-# Path to your file
-file_path = r'F:\Hauler\hauler_airgap_08_21_24.zst'
-
-# Benchmark native algorithms
-for algo in ['md5', 'sha1', 'sha256', 'sha3_256', 'blake2b']:
-    benchmark(file_path, algo)
-
-# Benchmark XXHash algorithms
-for algo in ['xxh64', 'xxh3_128']:
-    benchmark(file_path, algo, is_native=False)
+import hashlib
+import mmap
+import sys
+import time
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+def hash_buffer(mm, hasher):
+    """Hash a memory-mapped file in one buffer-protocol update."""
+    hasher.update(mm)
+    return hasher.hexdigest()
+
+def make_hasher(algorithm, is_native=True):
+    """Create a hasher instance for the given algorithm."""
+    if is_native:
+        return hashlib.new(algorithm)
+    if algorithm == 'blake3':
+        return blake3.blake3()
+    return xxhash.xxh64() if algorithm == 'xxh64' else xxhash.xxh3_128()
+
+def benchmark(mm, algorithm='sha256', is_native=True):
+    """Benchmark the time taken to hash a memory-mapped file."""
+    print(f"\nBenchmarking {algorithm.upper()}...")
+    hasher = make_hasher(algorithm, is_native)
+    start_time = time.time()
+
+    hash_value = hash_buffer(mm, hasher)
+
+    elapsed_time = time.time() - start_time
+    print(f"{algorithm.upper()} Hash: {hash_value}")
+    print(f"Time Taken: {elapsed_time:.2f} seconds")
+
+# Path to your file (or pass one on the command line)
+file_path = sys.argv[1] if len(sys.argv) > 1 else r'F:\Hauler\hauler_airgap_08_21_24.zst'
+
+# Map the file once; every algorithm hashes the same in-memory buffer, so
+# the numbers compare hash implementations instead of disk re-reads
+with open(file_path, 'rb') as f, \
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+    if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_WILLNEED'):
+        mm.madvise(mmap.MADV_WILLNEED)
+
+    # Warm-up pass faults every page in, so the first timed algorithm
+    # isn't charged the cold-cache read the later ones don't pay
+    hash_buffer(mm, hashlib.new('md5'))
+
+    # Benchmark native algorithms
+    for algo in ['md5', 'sha1', 'sha256', 'sha3_256', 'blake2b']:
+        benchmark(mm, algo)
+
+    # Benchmark XXHash algorithms
+    if xxhash is not None:
+        for algo in ['xxh64', 'xxh3_128']:
+            benchmark(mm, algo, is_native=False)
+    else:
+        print("\nxxhash not installed, skipping XXHash benchmarks")
+
+    # Benchmark BLAKE3 (SIMD tree hash; the chunker's preferred backend)
+    if blake3 is not None:
+        benchmark(mm, 'blake3', is_native=False)
+    else:
+        print("\nblake3 not installed, skipping BLAKE3 benchmark")